@@ -7,89 +7,311 @@ We prefer processes with the largest write_bytes delta; fallback to cpu_time del
 
 This is heuristic-based and not guaranteed. It is intended for audit/logging and
 to provide a "most-likely" suspect for the GUI/alerts.
+
+Snapshots only hold the counters needed for deltas (pid -> (write_bytes, cpu_time));
+process name and exe are resolved afterwards for the few top candidates only.
+
+Snapshots are taken in bulk where the OS allows it:
+- Windows: one NtQuerySystemInformation(SystemProcessInformation) call returns every
+  process with its CPU times and I/O transfer counters.
+- Linux: /proc/<pid>/stat and /proc/<pid>/io are read directly.
+psutil's per-process API is kept as the portable fallback.
 """
 
+import os
+import sys
+import heapq
 import psutil
 import time
 from typing import Dict, Tuple, Optional, List
 
-def snapshot_processes() -> Dict[int, dict]:
+from .config import ATTRIBUTION_CACHE_TTL
+
+_SYSTEM_PROCESS_INFORMATION = 5
+_STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+# last buffer size that was large enough for NtQuerySystemInformation; grows on demand
+_win_buf_size = 512 * 1024
+# counters for a pid missing from the "before" snapshot
+_NO_COUNTERS = (0, 0.0)
+# (pid, create_time) -> (name, exe) for processes that were reported as suspects; keyed on
+# the start time so a reused pid is resolved again, and pruned as pids exit
+_proc_info = {}
+# (monotonic_ts, snapshot) of the last snapshot taken for an incident; only incident_snapshot()
+# reads or fills it, so rolling "before" snapshots can never be handed back as an "after"
+_incident_snap = (0.0, None)
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class UNICODE_STRING(ctypes.Structure):
+        _fields_ = [
+            ("Length", wintypes.USHORT),
+            ("MaximumLength", wintypes.USHORT),
+            ("Buffer", ctypes.c_void_p),
+        ]
+
+    class SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("NextEntryOffset", wintypes.ULONG),
+            ("NumberOfThreads", wintypes.ULONG),
+            ("WorkingSetPrivateSize", ctypes.c_longlong),
+            ("HardFaultCount", wintypes.ULONG),
+            ("NumberOfThreadsHighWatermark", wintypes.ULONG),
+            ("CycleTime", ctypes.c_ulonglong),
+            ("CreateTime", ctypes.c_longlong),
+            ("UserTime", ctypes.c_longlong),
+            ("KernelTime", ctypes.c_longlong),
+            ("ImageName", UNICODE_STRING),
+            ("BasePriority", ctypes.c_long),
+            ("UniqueProcessId", ctypes.c_void_p),
+            ("InheritedFromUniqueProcessId", ctypes.c_void_p),
+            ("HandleCount", wintypes.ULONG),
+            ("SessionId", wintypes.ULONG),
+            ("UniqueProcessKey", ctypes.c_void_p),
+            ("PeakVirtualSize", ctypes.c_size_t),
+            ("VirtualSize", ctypes.c_size_t),
+            ("PageFaultCount", wintypes.ULONG),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+            ("PrivatePageCount", ctypes.c_size_t),
+            ("ReadOperationCount", ctypes.c_longlong),
+            ("WriteOperationCount", ctypes.c_longlong),
+            ("OtherOperationCount", ctypes.c_longlong),
+            ("ReadTransferCount", ctypes.c_longlong),
+            ("WriteTransferCount", ctypes.c_longlong),
+            ("OtherTransferCount", ctypes.c_longlong),
+        ]
+
+
+def _win_snapshot() -> Dict[int, Tuple[int, float]]:
+    """Snapshot all processes with a single NtQuerySystemInformation call."""
+    global _win_buf_size
+    ntdll = ctypes.windll.ntdll
+    ret_len = wintypes.ULONG(0)
+    while True:
+        buf = ctypes.create_string_buffer(_win_buf_size)
+        status = ntdll.NtQuerySystemInformation(
+            _SYSTEM_PROCESS_INFORMATION, buf, _win_buf_size, ctypes.byref(ret_len)
+        ) & 0xFFFFFFFF
+        if status == _STATUS_INFO_LENGTH_MISMATCH:
+            # process list grew between calls; retry with headroom
+            _win_buf_size = max(_win_buf_size * 2, ret_len.value + 64 * 1024)
+            continue
+        if status != 0:
+            raise OSError(f"NtQuerySystemInformation failed: 0x{status:08x}")
+        break
+
+    snap = {}
+    offset = 0
+    while True:
+        spi = SYSTEM_PROCESS_INFORMATION.from_buffer(buf, offset)
+        # UserTime/KernelTime are in 100ns units
+        snap[spi.UniqueProcessId or 0] = (spi.WriteTransferCount, (spi.UserTime + spi.KernelTime) / 1e7)
+        if not spi.NextEntryOffset:
+            break
+        offset += spi.NextEntryOffset
+    return snap
+
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _linux_snapshot() -> Dict[int, Tuple[int, float]]:
+    """Snapshot all processes by reading /proc/<pid>/stat and /proc/<pid>/io directly."""
+    snap = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        base = entry.path
+        try:
+            with open(base + "/stat", "rb") as fh:
+                stat = fh.read().decode("utf-8", "replace")
+        except OSError:
+            continue
+        # comm may contain spaces or parentheses, so split after the last ')'
+        rpar = stat.rfind(")")
+        fields = stat[rpar + 2:].split()
+        try:
+            cpu_time = (int(fields[11]) + int(fields[12])) / _CLK_TCK
+        except (IndexError, ValueError):
+            cpu_time = 0.0
+        write_bytes = 0
+        try:
+            with open(base + "/io", "rb") as fh:
+                for line in fh:
+                    if line.startswith(b"write_bytes:"):
+                        write_bytes = int(line.split()[1])
+                        break
+        except OSError:
+            # /proc/<pid>/io of other users' processes needs privileges
+            pass
+        snap[pid] = (write_bytes, cpu_time)
+    return snap
+
+
+def snapshot_processes() -> Dict[int, Tuple[int, float]]:
     """
-    Return a mapping pid -> metrics snapshot for currently running processes.
-    Metrics include: write_bytes (from io_counters when available), cpu_times (user+system),
-    name and exe path.
+    Return a mapping pid -> (write_bytes, cpu_time) for currently running processes,
+    where cpu_time is user+system seconds.
+    Uses the bulk platform reader when available and psutil otherwise.
     """
+    try:
+        if sys.platform == "win32":
+            return _win_snapshot()
+        if sys.platform.startswith("linux") and os.path.isdir("/proc"):
+            return _linux_snapshot()
+    except Exception:
+        pass
+    return _psutil_snapshot()
+
+
+def incident_snapshot(detected_at: float) -> Dict[int, Tuple[int, float]]:
+    """
+    Snapshot for the "after" side of an incident detected at monotonic time detected_at.
+    The previous incident snapshot is reused only if it was taken after detected_at and is at
+    most ATTRIBUTION_CACHE_TTL seconds old (queued back-to-back incidents share one scan);
+    otherwise a fresh snapshot is taken. Treat the result as read-only.
+    """
+    global _incident_snap
+    ts, snap = _incident_snap
+    now = time.monotonic()
+    if snap is not None and ts >= detected_at and now - ts <= ATTRIBUTION_CACHE_TTL:
+        return snap
+    snap = snapshot_processes()
+    _incident_snap = (now, snap)
+    return snap
+
+
+def _psutil_snapshot() -> Dict[int, Tuple[int, float]]:
+    """Portable snapshot via psutil's per-process API (no name/exe lookups)."""
     snap = {}
-    for p in psutil.process_iter(attrs=['pid', 'name', 'exe']):
+    for pid in psutil.pids():
         try:
-            info = p.info
-            pid = info['pid']
-            name = info.get('name') or ""
-            exe = info.get('exe') or ""
-            # safe attempt to get io counters and cpu times
+            p = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        # safe attempt to get io counters and cpu times
+        write_bytes = 0
+        try:
+            io = p.io_counters()
+            write_bytes = getattr(io, "write_bytes", 0) or 0
+        except Exception:
             write_bytes = 0
+        cpu_time = 0.0
+        try:
+            ct = p.cpu_times()
+            cpu_time = (getattr(ct, "user", 0.0) or 0.0) + (getattr(ct, "system", 0.0) or 0.0)
+        except Exception:
+            cpu_time = 0.0
+        snap[pid] = (write_bytes, cpu_time)
+    return snap
+
+def _describe(pid: int) -> Tuple[str, str]:
+    """Return (name, exe) for a pid, cached per (pid, create_time) across calls."""
+    try:
+        p = psutil.Process(pid)
+        key = (pid, p.create_time())
+    except Exception:
+        return "", ""
+    info = _proc_info.get(key)
+    if info is None:
+        name, exe = "", ""
+        with p.oneshot():
             try:
-                io = p.io_counters()
-                write_bytes = getattr(io, "write_bytes", 0) or 0
+                name = p.name() or ""
             except Exception:
-                write_bytes = 0
-            cpu_time = 0.0
+                pass
             try:
-                ct = p.cpu_times()
-                cpu_time = (getattr(ct, "user", 0.0) or 0.0) + (getattr(ct, "system", 0.0) or 0.0)
+                exe = p.exe() or ""
             except Exception:
-                cpu_time = 0.0
-
-            snap[pid] = {
-                "pid": pid,
-                "name": name,
-                "exe": exe,
-                "write_bytes": write_bytes,
-                "cpu_time": cpu_time
-            }
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return snap
+                pass
+        info = _proc_info[key] = (name, exe)
+    return info
+
+def _resolve(suspects: List[dict], after: Dict[int, Tuple[int, float]]) -> List[dict]:
+    """Attach name/exe to the selected suspects and forget cached info for exited pids."""
+    for key in [key for key in _proc_info if key[0] not in after]:
+        del _proc_info[key]
+    for s in suspects:
+        s["name"], s["exe"] = _describe(s["pid"])
+    return suspects
 
-def compute_deltas(before: Dict[int, dict], after: Dict[int, dict]) -> List[dict]:
+def compute_deltas(before: Dict[int, Tuple[int, float]], after: Dict[int, Tuple[int, float]],
+                   top_k: Optional[int] = None) -> List[dict]:
     """
-    Compute deltas for processes present in either snapshot.
-    Returns a list of candidate dicts with delta metrics.
+    Compute deltas for processes present in the `after` snapshot.
+    Processes with no write and no CPU activity are skipped (they cannot be suspects);
+    processes that exited in between have no activity to attribute either.
+    Returns candidate dicts (pid, delta_write, delta_cpu), highest delta_write then delta_cpu first;
+    if top_k is given only the top_k candidates are selected (heap, not a full sort).
     """
-    candidates = []
-    pids = set(before.keys()) | set(after.keys())
-    for pid in pids:
-        b = before.get(pid, {})
-        a = after.get(pid, {})
-        write_b = b.get("write_bytes", 0)
-        write_a = a.get("write_bytes", 0)
-        cpu_b = b.get("cpu_time", 0.0)
-        cpu_a = a.get("cpu_time", 0.0)
-        delta_write = max(0, write_a - write_b)
-        delta_cpu = max(0.0, cpu_a - cpu_b)
-        name = a.get("name") or b.get("name") or ""
-        exe = a.get("exe") or b.get("exe") or ""
-        candidates.append({
-            "pid": pid,
-            "name": name,
-            "exe": exe,
-            "delta_write": delta_write,
-            "delta_cpu": delta_cpu
-        })
-    # sort by delta_write desc, then delta_cpu desc
-    candidates.sort(key=lambda x: (x['delta_write'], x['delta_cpu']), reverse=True)
-    return candidates
-
-def identify_suspects(window_seconds: float = 0.6, top_k: int = 3) -> list:
+    get_before = before.get
+
+    def _candidates():
+        # plain (delta_write, delta_cpu, pid) tuples compare in C, so heapq/sorted need no key
+        for pid, (write_a, cpu_a) in after.items():
+            write_b, cpu_b = get_before(pid, _NO_COUNTERS)
+            delta_write = write_a - write_b
+            delta_cpu = cpu_a - cpu_b
+            if delta_write > 0 or delta_cpu > 0:
+                yield (max(0, delta_write), max(0.0, delta_cpu), pid)
+
+    if top_k is None:
+        selected = sorted(_candidates(), reverse=True)
+    else:
+        selected = heapq.nlargest(top_k, _candidates())
+    # only the selected candidates are turned into dicts
+    return [{"pid": pid, "delta_write": dw, "delta_cpu": dc} for dw, dc, pid in selected]
+
+# Last attribution result, keyed on the identity of the snapshots it was computed from:
+# (before, after, top_k, suspects)
+_cache = (None, None, None, None)
+
+def top_suspects(before: Dict[int, Tuple[int, float]], after: Dict[int, Tuple[int, float]],
+                 top_k: int = 3) -> List[dict]:
+    """
+    compute_deltas(before, after, top_k) with name/exe resolved for the selected suspects,
+    reusing the previous result when called again with the very same snapshot objects
+    (e.g. back-to-back incidents sharing one incident_snapshot()).
+    """
+    global _cache
+    c_before, c_after, c_top_k, c_suspects = _cache
+    if before is c_before and after is c_after and top_k == c_top_k:
+        return list(c_suspects)
+    suspects = _resolve(compute_deltas(before, after, top_k=top_k), after)
+    _cache = (before, after, top_k, suspects)
+    return list(suspects)
+
+def identify_suspects(window_seconds: float = 0.6, top_k: int = 3,
+                      before: Optional[Dict[int, Tuple[int, float]]] = None,
+                      detected_at: Optional[float] = None) -> list:
     """
     Take two snapshots separated by window_seconds, compute deltas, and return top_k suspects.
+    If `before` is given (e.g. a snapshot the caller took on an earlier idle tick), it is used
+    as the first snapshot and no sleep is needed. If detected_at (monotonic time the incident
+    was detected) is also given, the "after" side comes from incident_snapshot(detected_at).
     Each suspect is a dict with pid,name,exe,delta_write,delta_cpu.
     """
-    before = snapshot_processes()
-    time.sleep(window_seconds)
-    after = snapshot_processes()
-    deltas = compute_deltas(before, after)
-    return deltas[:top_k]
+    if before is None:
+        before = snapshot_processes()
+        time.sleep(window_seconds)
+        after = snapshot_processes()
+    elif detected_at is not None:
+        after = incident_snapshot(detected_at)
+    else:
+        after = snapshot_processes()
+    if after is before:
+        after = snapshot_processes()
+    return top_suspects(before, after, top_k=top_k)
 
 def format_suspect(s: dict) -> str:
     return f"pid={s['pid']} name={s['name']} exe={s['exe']} write_delta={s['delta_write']} cpu_delta={s['delta_cpu']}"
@@ -0,0 +1,75 @@
+# clipboardguard/attributor_worker.py
+"""
+Background sampler for process attribution.
+
+A daemon thread takes a process snapshot every ATTRIBUTION_WORKER_INTERVAL seconds
+and keeps the most recent ones in a small ring buffer. When a suspicious clipboard
+change is detected, recent_suspects() diffs a fresh snapshot against the oldest
+buffered one, so the monitor never has to sleep for the attribution window.
+
+Every sample is a full process-table scan, so the worker is opt-in (config.ATTRIBUTION_WORKER):
+it trades idle CPU for attribution windows that always cover the hijack.
+"""
+
+import math
+import time
+import threading
+from collections import deque
+from typing import Optional
+
+from .attributor import snapshot_processes, incident_snapshot, top_suspects
+from .config import ATTRIBUTION_SNAPSHOT_INTERVAL, ATTRIBUTION_WORKER_INTERVAL
+
+# enough entries that the oldest one is roughly ATTRIBUTION_SNAPSHOT_INTERVAL old
+_RING_SIZE = max(2, math.ceil(ATTRIBUTION_SNAPSHOT_INTERVAL / ATTRIBUTION_WORKER_INTERVAL) + 1)
+
+# ring of (monotonic_ts, snapshot); appended by the worker, read without locking
+_ring = deque(maxlen=_RING_SIZE)
+_thread = None
+_stop = threading.Event()
+
+
+def _run():
+    while not _stop.is_set():
+        try:
+            _ring.append((time.monotonic(), snapshot_processes()))
+        except Exception:
+            pass
+        _stop.wait(ATTRIBUTION_WORKER_INTERVAL)
+
+
+def start_worker():
+    """
+    Start the sampling thread. Safe to call multiple times.
+    """
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="attributor-worker", daemon=True)
+    _thread.start()
+
+
+def stop_worker():
+    global _thread
+    _stop.set()
+    _thread = None
+
+
+def is_running() -> bool:
+    return _thread is not None and _thread.is_alive() and len(_ring) > 0
+
+
+def recent_suspects(top_k: int = 3, detected_at: Optional[float] = None) -> Optional[list]:
+    """
+    Return the top_k suspects over roughly the last ATTRIBUTION_SNAPSHOT_INTERVAL seconds,
+    or None if no buffered snapshot is available yet.
+    The "after" side is never a ring entry: it is incident_snapshot(detected_at), i.e. taken
+    after the incident was detected, or a fresh snapshot if detected_at is not given.
+    """
+    try:
+        _, before = _ring[0]
+    except IndexError:
+        return None
+    after = incident_snapshot(detected_at) if detected_at is not None else snapshot_processes()
+    return top_suspects(before, after, top_k=top_k)
@@ -1,7 +1,9 @@
 # clipboardguard/auto_attack_launcher.py
 """
 Monitor clipboard for the first manual copy, then launch the attacker script
-in a new PowerShell window (Terminal B) using the project's venv python.
+in a new console window (Terminal B) using the project's venv python.
+Waits on OS clipboard notifications (clipboard_watch.py) when available and
+exits once the attacker has been launched.
 
 Usage:
   # from project root (with venv active)
@@ -9,13 +11,16 @@ Usage:
 """
 
 import time
-import pyperclip
+import threading
 import subprocess
 import sys
 import os
 from pathlib import Path
 
-POLL_INTERVAL = 0.5  # seconds (clipboard polling)
+from .config import POLL_INTERVAL_MIN, POLL_INTERVAL_MAX, POLL_BACKOFF, WATCHDOG_INTERVAL
+from .clipboard_watch import start_watcher, stop_watcher
+from . import clipboard_fast
+
 SPAWNED = False
 
 def get_project_root():
@@ -26,23 +31,15 @@ def get_project_root():
     except Exception:
         return Path.cwd()
 
-def build_powershell_command(project_root: Path):
+def build_attacker_command(project_root: Path) -> list:
     """
-    Build a PowerShell command that opens a new window and runs the attacker
-    using the venv python executable so the venv packages are used.
+    Build the argv that runs the attacker with the venv python executable
+    so the venv packages are used.
     """
     venv_python = project_root / "venv" / "Scripts" / "python.exe"
     attacker = project_root / "tests" / "simulate_attacker.py"
-
-    # Use full paths and escape quotes
-    vpython = str(venv_python).replace("'", "''")
-    pattacker = str(attacker).replace("'", "''")
-
-    # The -NoExit keeps the new PowerShell window open so you can see output.
-    # We use & '<path>' '<script>' to invoke the venv python explicitly.
-    cmd = f"Start-Process powershell -ArgumentList '-NoExit','-Command','& \"{vpython}\" \"{pattacker}\"'"
-
-    return cmd
+    # -i keeps the new console open after the script finishes so you can see output
+    return [str(venv_python), "-i", str(attacker)]
 
 def main():
     global SPAWNED
@@ -52,41 +49,47 @@ def main():
 
     last = ""
     try:
-        last = pyperclip.paste() or ""
+        last = clipboard_fast.paste() or ""
     except Exception:
         last = ""
 
-    ps_command = build_powershell_command(project_root)
-    # We will run the powershell command via subprocess when a new copy is detected.
+    attacker_cmd = build_attacker_command(project_root)
+    # We will start the attacker via subprocess when a new copy is detected.
 
+    # wake on clipboard notifications; otherwise poll adaptively (fast right after a change,
+    # backing off while the clipboard is idle)
+    wake = threading.Event()
+    events = start_watcher(wake.set)
+    interval = POLL_INTERVAL_MIN
     while True:
         try:
-            current = pyperclip.paste() or ""
+            current = clipboard_fast.paste()
         except Exception:
-            current = ""
+            current = None
 
-        if current != last:
+        # None = read failed; try again on the next tick
+        if current is not None and current != last:
             print(f"[+] Clipboard changed. New value (first 80 chars): {current[:80]!r}")
-            # If not spawned yet, spawn attacker in new PowerShell window
-            if not SPAWNED:
-                print("[*] Spawning attacker in new PowerShell window...")
-                # Use powershell to run the Start-Process call
-                # Note: We call powershell.exe with -Command to execute the Start-Process string.
-                try:
-                    subprocess.Popen(["powershell.exe", "-NoProfile", "-Command", ps_command],
-                                     stdout=subprocess.DEVNULL,
-                                     stderr=subprocess.DEVNULL,
-                                     creationflags=0)
-                    print("[*] Attacker launched (Terminal B).")
-                except Exception as e:
-                    print("[!] Failed to spawn attacker:", e)
-                SPAWNED = True
-            else:
-                # if attacker already spawned, just print and continue monitoring
-                print("[*] Attacker already spawned. Monitoring continues.")
-            last = current
-
-        time.sleep(POLL_INTERVAL)
+            # spawn attacker in a new console window, then stop watching
+            print("[*] Spawning attacker in new console window...")
+            # CREATE_NEW_CONSOLE gives the venv python its own window directly,
+            # without starting powershell.exe just to call Start-Process.
+            try:
+                subprocess.Popen(attacker_cmd,
+                                 creationflags=getattr(subprocess, "CREATE_NEW_CONSOLE", 0))
+                print("[*] Attacker launched (Terminal B).")
+            except Exception as e:
+                print("[!] Failed to spawn attacker:", e)
+            SPAWNED = True
+            stop_watcher()
+            return
+
+        if events:
+            wake.wait(WATCHDOG_INTERVAL)
+            wake.clear()
+        else:
+            interval = min(interval * POLL_BACKOFF, POLL_INTERVAL_MAX)
+            time.sleep(interval)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+# clipboardguard/clipboard_fast.py
+"""
+Read clipboard text through the platform APIs directly instead of pyperclip.
+
+pyperclip forks xclip/xsel for every read on Linux and adds several layers of Python
+indirection on Windows. paste() here uses:
+- Windows: OpenClipboard / GetClipboardData(CF_UNICODETEXT) / GlobalLock via ctypes.
+- macOS: NSPasteboard.stringForType_(NSPasteboardTypeString) on a cached pasteboard.
+- Linux/X11: a persistent python-xlib Display that asks the CLIPBOARD owner to convert
+  the selection to UTF8_STRING on a private window (no subprocess per read).
+Whenever a backend is unavailable or a read can't be completed (clipboard locked by another
+process, owner doesn't answer, INCR transfer for very large data) it falls back to pyperclip.
+If that fails too, paste() returns None so callers can tell a failed read from an empty clipboard.
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Optional
+
+import pyperclip
+
+CF_UNICODETEXT = 13
+# how long to wait for the X11 selection owner to answer a conversion request (seconds)
+X11_CONVERT_TIMEOUT = 0.25
+# number of selection properties rotated between X11 requests
+X11_PROPERTY_RING = 4
+
+# platform reader: callable returning the clipboard text, or None to use pyperclip
+_reader = None
+_initialized = False
+_lock = threading.Lock()
+
+
+def _win_reader():
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    user32.OpenClipboard.argtypes = [wintypes.HWND]
+    user32.OpenClipboard.restype = wintypes.BOOL
+    user32.GetClipboardData.argtypes = [wintypes.UINT]
+    user32.GetClipboardData.restype = wintypes.HANDLE
+    user32.CloseClipboard.restype = wintypes.BOOL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = wintypes.LPVOID
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+
+    def _read():
+        # another process holds the clipboard; let pyperclip (which retries) handle it
+        if not user32.OpenClipboard(None):
+            return None
+        try:
+            h = user32.GetClipboardData(CF_UNICODETEXT)
+            if not h:
+                return ""
+            p = kernel32.GlobalLock(h)
+            if not p:
+                return None
+            try:
+                return ctypes.wstring_at(p)
+            finally:
+                kernel32.GlobalUnlock(h)
+        finally:
+            user32.CloseClipboard()
+
+    return _read
+
+
+def _mac_reader():
+    from AppKit import NSPasteboard, NSPasteboardTypeString
+
+    pb = NSPasteboard.generalPasteboard()
+
+    def _read():
+        text = pb.stringForType_(NSPasteboardTypeString)
+        return str(text) if text is not None else ""
+
+    return _read
+
+
+def _x11_reader():
+    from Xlib import X, display
+
+    d = display.Display()
+    win = d.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+    clipboard = d.intern_atom("CLIPBOARD")
+    utf8 = d.intern_atom("UTF8_STRING")
+    # each request targets the next property in this ring, so a late reply to an earlier
+    # (timed-out) request can't be mistaken for the answer to the current one
+    props = [d.intern_atom("CLIPBOARDGUARD_SELECTION_%d" % i) for i in range(X11_PROPERTY_RING)]
+    incr = d.intern_atom("INCR")
+    state = {"next": 0}
+
+    def _read():
+        owner = d.get_selection_owner(clipboard)
+        if not getattr(owner, "id", owner):
+            return ""
+        # drop replies still queued from earlier requests
+        while d.pending_events():
+            d.next_event()
+        prop = props[state["next"]]
+        state["next"] = (state["next"] + 1) % X11_PROPERTY_RING
+        # clear anything a late reply may have stored under this property
+        win.delete_property(prop)
+        win.convert_selection(clipboard, utf8, prop, X.CurrentTime)
+        d.flush()
+        deadline = time.monotonic() + X11_CONVERT_TIMEOUT
+        while time.monotonic() < deadline:
+            if not d.pending_events():
+                time.sleep(0.001)
+                continue
+            e = d.next_event()
+            if e.type != X.SelectionNotify or e.selection != clipboard:
+                continue
+            if getattr(e.requestor, "id", e.requestor) != win.id:
+                continue
+            if e.property == X.NONE:
+                # owner can't provide UTF8_STRING (or a late refusal); pyperclip re-reads
+                return None
+            if e.property != prop:
+                # late reply to an earlier request
+                continue
+            reply = win.get_full_property(prop, X.AnyPropertyType)
+            win.delete_property(prop)
+            d.flush()
+            if reply is None or reply.property_type == incr:
+                return None
+            value = reply.value
+            if isinstance(value, bytes):
+                return value.decode("utf-8", "replace")
+            return None
+        return None
+
+    return _read
+
+
+def _init():
+    global _reader, _initialized
+    _initialized = True
+    try:
+        if sys.platform == "win32":
+            _reader = _win_reader()
+        elif sys.platform == "darwin":
+            _reader = _mac_reader()
+        elif sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+            _reader = _x11_reader()
+    except Exception:
+        _reader = None
+
+
+def paste() -> Optional[str]:
+    """Return the current clipboard text ("" if empty), or None if it could not be read."""
+    with _lock:
+        if not _initialized:
+            _init()
+        if _reader is not None:
+            try:
+                text = _reader()
+                if text is not None:
+                    return text
+            except Exception:
+                pass
+    try:
+        return pyperclip.paste() or ""
+    except Exception:
+        return None
@@ -0,0 +1,205 @@
+# clipboardguard/clipboard_watch.py
+"""
+Push-based clipboard change notifications.
+
+Instead of repeatedly reading the clipboard, ask the OS to tell us when it changes:
+- Windows: a message-only window registered with AddClipboardFormatListener
+  receives WM_CLIPBOARDUPDATE for every clipboard write.
+- Linux/X11: XFixes SetSelectionOwnerNotify events on the CLIPBOARD selection
+  (requires python-xlib); the thread blocks in display.next_event().
+
+The watcher runs in a daemon thread and invokes a callback on each change.
+If no backend is available, start_watcher() returns False and callers should
+keep polling. macOS has no clipboard-change notification, so it always polls;
+change_token() (NSPasteboard.changeCount) lets those polls skip reading the data.
+"""
+
+import os
+import sys
+import threading
+
+WM_CLIPBOARDUPDATE = 0x031D
+WM_QUIT = 0x0012
+HWND_MESSAGE = -3
+
+_thread = None
+_thread_id = None
+_stop = threading.Event()
+
+
+def _win_watch(callback, ready: threading.Event, result: list):
+    """Create a message-only window, subscribe to clipboard updates and pump messages."""
+    global _thread_id
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    LRESULT = ctypes.c_ssize_t
+    WNDPROC = ctypes.WINFUNCTYPE(LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+
+    class WNDCLASSW(ctypes.Structure):
+        _fields_ = [
+            ("style", wintypes.UINT),
+            ("lpfnWndProc", WNDPROC),
+            ("cbClsExtra", ctypes.c_int),
+            ("cbWndExtra", ctypes.c_int),
+            ("hInstance", wintypes.HINSTANCE),
+            ("hIcon", wintypes.HICON),
+            ("hCursor", wintypes.HANDLE),
+            ("hbrBackground", wintypes.HBRUSH),
+            ("lpszMenuName", wintypes.LPCWSTR),
+            ("lpszClassName", wintypes.LPCWSTR),
+        ]
+
+    user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    user32.DefWindowProcW.restype = LRESULT
+    user32.CreateWindowExW.argtypes = [
+        wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID,
+    ]
+    user32.CreateWindowExW.restype = wintypes.HWND
+    user32.AddClipboardFormatListener.argtypes = [wintypes.HWND]
+    user32.RemoveClipboardFormatListener.argtypes = [wintypes.HWND]
+
+    def _wndproc(hwnd, msg, wparam, lparam):
+        if msg == WM_CLIPBOARDUPDATE:
+            try:
+                callback()
+            except Exception:
+                pass
+            return 0
+        return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+    # keep a reference to the ctypes callback for the lifetime of the window
+    wndproc = WNDPROC(_wndproc)
+    hinst = kernel32.GetModuleHandleW(None)
+    wc = WNDCLASSW()
+    wc.lpfnWndProc = wndproc
+    wc.hInstance = hinst
+    wc.lpszClassName = "ClipboardGuardWatcher"
+    user32.RegisterClassW(ctypes.byref(wc))
+
+    hwnd = user32.CreateWindowExW(0, wc.lpszClassName, "ClipboardGuard", 0, 0, 0, 0, 0,
+                                  HWND_MESSAGE, None, hinst, None)
+    if not hwnd or not user32.AddClipboardFormatListener(hwnd):
+        ready.set()
+        return
+
+    _thread_id = kernel32.GetCurrentThreadId()
+    result.append(True)
+    ready.set()
+
+    msg = wintypes.MSG()
+    try:
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+    finally:
+        user32.RemoveClipboardFormatListener(hwnd)
+        user32.DestroyWindow(hwnd)
+
+
+def _x11_watch(callback, ready: threading.Event, result: list):
+    """Subscribe to XFixes selection-owner changes of CLIPBOARD and block on X events."""
+    from Xlib import display
+    from Xlib.ext import xfixes
+
+    d = display.Display()
+    if not d.has_extension("XFIXES"):
+        d.close()
+        return
+    d.xfixes_query_version()
+    clipboard = d.intern_atom("CLIPBOARD")
+    d.screen().root.xfixes_select_selection_input(clipboard, xfixes.XFixesSetSelectionOwnerNotifyMask)
+    d.flush()
+    result.append(True)
+    ready.set()
+    owner_notify = d.extension_event.SetSelectionOwnerNotify
+    while not _stop.is_set():
+        e = d.next_event()
+        if (e.type, getattr(e, "sub_code", None)) == owner_notify:
+            try:
+                callback()
+            except Exception:
+                pass
+
+
+def _backend():
+    if sys.platform == "win32":
+        return _win_watch
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        return _x11_watch
+    return None
+
+
+_pasteboard = None
+
+
+def change_token():
+    """
+    Return the OS clipboard change counter (Windows GetClipboardSequenceNumber, macOS
+    NSPasteboard.changeCount), or None if the platform has none. Comparing tokens tells
+    whether the clipboard was written without reading its contents.
+    """
+    global _pasteboard
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            return ctypes.windll.user32.GetClipboardSequenceNumber()
+        if sys.platform == "darwin":
+            if _pasteboard is None:
+                from AppKit import NSPasteboard
+                _pasteboard = NSPasteboard.generalPasteboard()
+            return _pasteboard.changeCount()
+    except Exception:
+        pass
+    return None
+
+
+def start_watcher(callback) -> bool:
+    """
+    Start watching the clipboard in a background thread; callback() is invoked on every change.
+    Returns True if a push-based backend is running, False if the caller should fall back to polling.
+    Safe to call multiple times.
+    """
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return True
+    backend = _backend()
+    if backend is None:
+        return False
+
+    ready = threading.Event()
+    result = []
+
+    def _run():
+        try:
+            backend(callback, ready, result)
+        except ImportError as e:
+            print(f"[*] Clipboard notifications unavailable ({e}); install python-xlib for X11 events.")
+        except Exception:
+            pass
+        finally:
+            ready.set()
+
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="clipboard-watch", daemon=True)
+    _thread.start()
+    ready.wait(timeout=2.0)
+    return bool(result)
+
+
+def stop_watcher():
+    global _thread, _thread_id
+    _stop.set()
+    if _thread_id is not None:
+        try:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(_thread_id, WM_QUIT, 0, 0)
+        except Exception:
+            pass
+        _thread_id = None
+    _thread = None
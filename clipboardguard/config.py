@@ -3,6 +3,9 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 LOG_CSV = os.path.join(BASE_DIR, "logs.csv")
+# Log rows are buffered and written in batches (see logger.py)
+LOG_FLUSH_INTERVAL = 0.5   # seconds between background flushes
+LOG_FLUSH_ROWS = 32        # flush early once this many rows are pending
 
 # Patterns considered sensitive (extendable)
 PATTERNS = {
@@ -16,10 +19,27 @@ PATTERNS = {
 
 # How many seconds between clipboard polls
 POLL_INTERVAL = 0.6
+# Adaptive polling: poll fast right after a change, then back off while the clipboard is idle.
+# Polling starts at POLL_INTERVAL, and backing off after a burst resumes from it.
+POLL_INTERVAL_MIN = 0.1
+POLL_INTERVAL_MAX = 2.0
+POLL_BACKOFF = 1.5
+POLL_IDLE_GRACE_TICKS = 10   # unchanged reads at POLL_INTERVAL_MIN before backing off
+
+# Use OS clipboard-change notifications (clipboard_watch.py) instead of polling when available
+USE_CLIPBOARD_EVENTS = True
+# With notifications active, still re-read the clipboard this often (secs) as a watchdog
+WATCHDOG_INTERVAL = 2.5
 
 # Attribution & safety
 ATTRIBUTION_SNAPSHOT_INTERVAL = 0.6   # seconds between process snapshots for delta
 ATTRIBUTION_TOP_K = 3                 # if multiple candidates, use up-to-top_k for logging
+# Sample processes in a background thread (attributor_worker.py). Off by default: it rescans the
+# whole process table every ATTRIBUTION_WORKER_INTERVAL even while the clipboard is idle; without
+# it the monitor keeps its own rolling snapshot on idle ticks instead.
+ATTRIBUTION_WORKER = False
+ATTRIBUTION_WORKER_INTERVAL = 0.3     # seconds between background process snapshots
+ATTRIBUTION_CACHE_TTL = 0.5           # queued incidents detected before an incident snapshot this recent reuse it
 # Basic whitelist (names or exe basenames). Add common system/known safe names here.
 WHITELIST_NAMES = {
     "explorer.exe",
@@ -28,6 +48,15 @@ WHITELIST_NAMES = {
     "svchost.exe",
     # add more like "chrome.exe", "code.exe" if you trust them
 }
+# Lowercased once at import so whitelist checks don't re-lower every entry per suspect
+WHITELIST_LOWER = frozenset(w.lower() for w in WHITELIST_NAMES)
+# Max suspicious changes waiting for attribution/logging on the incident worker thread
+INCIDENT_QUEUE_SIZE = 64
+# Max web-sync posts waiting for the sync_web worker; the oldest is dropped when full
+SYNC_QUEUE_SIZE = 32
+# Identical trusted values synced within this many seconds are posted only once
+SYNC_DEDUP_WINDOW = 60.0
+SYNC_DEDUP_MAX = 256
 # If True the monitor will try to terminate suspected malicious process (USE WITH CARE)
 AUTO_TERMINATE = False
 # If AUTO_TERMINATE True, this is the graceful timeout before force-kill (secs)
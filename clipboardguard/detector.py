@@ -1,33 +1,88 @@
 # clipboardguard/detector.py
+import functools
+from operator import itemgetter
 import regex as re
 from .config import PATTERNS
 
+# Prefer Google RE2 (linear-time DFA, no catastrophic backtracking) when installed
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+def _compile(pattern: str):
+    """Compile with RE2 when available and the pattern is RE2-compatible, else with `regex`."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+# Cheap per-type pre-filter: (shortest possible match, substrings at least one of which every
+# match contains). A type is only scanned for when the text is long enough and contains one of
+# its trigger substrings; `in` on str is a C-level memchr/fastsearch scan. Types without hints
+# (user-added PATTERNS) are always scanned.
+_TYPE_HINTS = {
+    "crypto_address": (26, ("0x", "1", "3")),   # ETH starts with 0x, BTC with 1/3
+    "email": (6, ("@",)),
+    "jwt": (5, (".",)),
+}
+_ALL_TYPES = tuple(PATTERNS)
+_matched_text = itemgetter(1)
+
+def _active_types(text: str) -> tuple:
+    """Pattern types that could possibly match text."""
+    n = len(text)
+    active = []
+    for key in _ALL_TYPES:
+        hint = _TYPE_HINTS.get(key)
+        if hint is None or (n >= hint[0] and any(t in text for t in hint[1])):
+            active.append(key)
+    return tuple(active)
+
 # compile patterns for speed
 COMPILED = {}
 for key, pat_list in PATTERNS.items():
-    COMPILED[key] = [re.compile(p) for p in pat_list]
+    COMPILED[key] = [_compile(p) for p in pat_list]
 
-def find_sensitive_matches(text: str):
+@functools.lru_cache(maxsize=4)
+def _find_cached(text: str, types: tuple) -> tuple:
     """
-    Returns list of tuples (pattern_type, matched_text)
+    Scan text for `types`; cached so back-to-back identical reads scan once.
+    Each pattern is scanned on its own so matches of different types may overlap
+    (e.g. an ETH address inside a JWT-shaped string is reported as both).
     """
     matches = []
-    if not text:
-        return matches
-    for ptype, compiled_list in COMPILED.items():
-        for cre in compiled_list:
+    for ptype in types:
+        for cre in COMPILED[ptype]:
             for m in cre.finditer(text):
                 matches.append((ptype, m.group(0)))
-    return matches
+    return tuple(matches)
 
-def is_suspicious_change(prev_text: str, new_text: str):
+def find_sensitive_matches(text: str):
+    """
+    Returns list of tuples (pattern_type, matched_text)
+    """
+    if not text:
+        return []
+    types = _active_types(text)
+    if not types:
+        return []
+    return list(_find_cached(text, types))
+
+def is_suspicious_change(prev_text: str, new_text: str, prev_matches=None):
     """
     Heuristic:
     - If prev_text contained a sensitive pattern, and new_text contains a different sensitive string of the same type,
       consider it suspicious.
     - Or if new_text contains sensitive pattern but prev_text didn't (could be paste of sensitive but not necessarily hijack).
+
+    Callers that already scanned prev_text (e.g. on the previous tick) can pass its matches
+    as prev_matches to avoid scanning it again.
     """
-    prev_matches = find_sensitive_matches(prev_text)
+    if prev_matches is None:
+        prev_matches = find_sensitive_matches(prev_text)
     new_matches = find_sensitive_matches(new_text)
 
     if not new_matches:
@@ -35,15 +90,11 @@ def is_suspicious_change(prev_text: str, new_text: str):
 
     # if prev had matches but different content -> suspicious replacement
     if prev_matches:
-        # create sets of matched strings for comparison
-        prev_set = set((t for _, t in prev_matches))
-        new_set = set((t for _, t in new_matches))
-        if prev_set != new_set:
+        # compare the sets of matched strings
+        if set(map(_matched_text, prev_matches)) != set(map(_matched_text, new_matches)):
             return True, new_matches
+        return False, new_matches
 
     # If new contains sensitive data but prev did not, we flag -> returns True (user pasted sensitive)
     # For MVP we will treat this as suspicious to be safe; later add heuristics or user prompts.
-    if not prev_matches and new_matches:
-        return True, new_matches
-
-    return False, new_matches
+    return True, new_matches
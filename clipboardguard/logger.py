@@ -4,16 +4,32 @@ Simple, thread-safe CSV logger for ClipboardGuard.
 
 Creates LOG_CSV if missing and appends incidents with a UTC timestamp.
 Fields: timestamp,event,prev_clipboard,new_clipboard,detected_types
+
+Rows are buffered in memory and written in batches by a background flusher thread
+(every LOG_FLUSH_INTERVAL seconds, or sooner once LOG_FLUSH_ROWS rows are pending).
+Pending rows are flushed at interpreter exit and included by read_recent().
+The CSV is kept open in append mode for the life of the process.
 """
 
+import atexit
 import csv
+import io
 import os
 import threading
+from collections import deque
 from datetime import datetime
-from .config import LOG_CSV
+from .config import LOG_CSV, LOG_FLUSH_INTERVAL, LOG_FLUSH_ROWS
 
 HEADER = ["timestamp", "event", "prev_clipboard", "new_clipboard", "detected_types"]
+# guards the CSV file; always taken before _buf_lock
 _lock = threading.Lock()
+# guards the pending-row buffer
+_buf_lock = threading.Lock()
+_buffer = deque()
+_flush_now = threading.Event()
+_flusher = None
+# initial guess of bytes per row when reading the tail of the log
+_TAIL_BYTES_PER_ROW = 256
 
 def ensure_log():
     """Ensure the log directory and file exist and have a header."""
@@ -26,47 +42,110 @@ def ensure_log():
             writer = csv.writer(fh)
             writer.writerow(HEADER)
 
+# replace newlines which can break CSV readability (single pass via str.translate)
+_NEWLINES_TO_SPACES = str.maketrans({"\r": " ", "\n": " "})
+
 def _sanitize_field(value: str) -> str:
     """Prepare field for CSV: convert to str and replace newlines/carriage returns."""
     if value is None:
         return ""
-    # replace newlines which can break CSV readability
-    return str(value).replace("\r", " ").replace("\n", " ")
+    return str(value).translate(_NEWLINES_TO_SPACES)
+
+def flush():
+    """Write all pending rows to the open LOG_CSV handle in one batch."""
+    with _lock:
+        with _buf_lock:
+            if not _buffer:
+                return
+            rows = list(_buffer)
+            _buffer.clear()
+        _writer.writerows(rows)
+        _FH.flush()
 
-def log_event(event: str, prev: str, new: str, det_types):
+def _flush_loop():
+    while True:
+        _flush_now.wait(LOG_FLUSH_INTERVAL)
+        _flush_now.clear()
+        try:
+            flush()
+        except Exception:
+            pass
+
+def _start_flusher():
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="log-flusher", daemon=True)
+        _flusher.start()
+
+def log_event(event: str, prev: str, new: str, det_types, ts: str = None):
     """
-    Append an event row to the CSV log.
+    Queue an event row for the CSV log.
 
     Args:
         event: short event name, e.g., "suspicious_change", "restored"
         prev: previous clipboard value
         new: new clipboard value
         det_types: iterable of detected pattern types (e.g., ["crypto_address", "jwt"])
+        ts: ISO timestamp of when the event happened (defaults to now)
     """
-    ensure_log()
     types_field = ";".join(det_types) if det_types else ""
     row = [
-        datetime.utcnow().isoformat() + "Z",
+        ts or datetime.utcnow().isoformat() + "Z",
         _sanitize_field(event),
         _sanitize_field(prev),
         _sanitize_field(new),
         _sanitize_field(types_field),
     ]
-    with _lock:
-        with open(LOG_CSV, "a", newline="", encoding="utf-8") as fh:
-            writer = csv.writer(fh)
-            writer.writerow(row)
+    with _buf_lock:
+        _buffer.append(row)
+        pending = len(_buffer)
+    if pending >= LOG_FLUSH_ROWS:
+        _flush_now.set()
+    _start_flusher()
+
+def _read_tail(n: int) -> list:
+    """
+    Read only the end of LOG_CSV and return its last `n` rows as dicts keyed by the file header.
+    Fields never contain newlines (see _sanitize_field), so after seeking into the middle of the
+    file the partial first line can simply be dropped. The window doubles until it holds n rows.
+    """
+    with open(LOG_CSV, "rb") as fh:
+        header_line = fh.readline()
+        data_start = fh.tell()
+        fh.seek(0, os.SEEK_END)
+        size = fh.tell()
+        window = max(4096, _TAIL_BYTES_PER_ROW * n)
+        while True:
+            start = max(data_start, size - window)
+            fh.seek(start)
+            tail = fh.read(size - start)
+            if start > data_start:
+                tail = tail.split(b"\n", 1)[1] if b"\n" in tail else b""
+            rows = [r for r in csv.reader(io.StringIO(tail.decode("utf-8", "replace"))) if r]
+            if len(rows) >= n or start == data_start:
+                break
+            window *= 2
+    header = next(csv.reader([header_line.decode("utf-8", "replace")]), HEADER)
+    return [dict(zip(header, r)) for r in rows[-n:]]
 
 def read_recent(n=50):
     """
     Return the last `n` log rows (excluding header) as a list of dicts.
     Useful for showing recent events in a GUI.
     """
-    ensure_log()
-    rows = []
     with _lock:
-        with open(LOG_CSV, "r", newline="", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh)
-            for r in reader:
-                rows.append(r)
+        rows = _read_tail(n)
+        with _buf_lock:
+            pending = list(_buffer)
+    rows.extend(dict(zip(HEADER, r)) for r in pending)
     return rows[-n:]
+
+def _close():
+    flush()
+    with _lock:
+        _FH.close()
+
+ensure_log()
+_FH = open(LOG_CSV, "a", newline="", encoding="utf-8", buffering=1)
+_writer = csv.writer(_FH)
+atexit.register(_close)
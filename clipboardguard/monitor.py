@@ -3,7 +3,8 @@
 ClipboardGuard main monitor.
 
 Features:
-- Clipboard polling and sensitive-pattern detection (uses detector.py)
+- Clipboard change notifications with polling fallback (uses clipboard_watch.py)
+- Sensitive-pattern detection (uses detector.py)
 - Attribution heuristics (uses attributor.py)
 - Trusted-value handling (uses trust_db.py)
 - User-copy detection via keyboard (uses user_intent.py)
@@ -12,6 +13,9 @@ Features:
 """
 
 import time
+import queue
+import threading
+from datetime import datetime
 import pyperclip
 import os
 import psutil
@@ -21,15 +25,26 @@ from .sync_web import sync_trusted, sync_untrusted
 from .logger import log_event
 from .config import (
     POLL_INTERVAL,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_MAX,
+    POLL_BACKOFF,
+    POLL_IDLE_GRACE_TICKS,
+    USE_CLIPBOARD_EVENTS,
+    WATCHDOG_INTERVAL,
     ATTRIBUTION_SNAPSHOT_INTERVAL,
-    WHITELIST_NAMES,
+    WHITELIST_LOWER,
     AUTO_TERMINATE,
     TERMINATE_WAIT_SECONDS,
     ATTRIBUTION_TOP_K,
+    ATTRIBUTION_WORKER,
+    INCIDENT_QUEUE_SIZE,
 )
-from .attributor import identify_suspects, format_suspect
+from .attributor import identify_suspects, format_suspect, snapshot_processes
+from . import attributor_worker
 from .user_intent import start_listener, was_recent_user_copy
-from .trust_db import is_trusted, add_trusted
+from .clipboard_watch import start_watcher, change_token
+from . import clipboard_fast
+from .trust_db import hash_value, is_trusted_hash, add_trusted_hash, get_trusted_hashes
 from typing import List
 
 # Optional: GUI confirmation for unknown sensitive values (fallback if no Ctrl+C detected)
@@ -65,26 +80,55 @@ class ClipboardGuardCore:
     def __init__(self):
         self._last = ""
         try:
-            self._last = pyperclip.paste() or ""
+            self._last = clipboard_fast.paste() or ""
         except Exception:
             self._last = ""
+        # detector matches for self._last (None = not scanned yet)
+        self._last_matches = None
+        # OS clipboard change counter at the last read (None = unknown / not supported)
+        self._last_token = None
         self.running = False
         self.self_pid = os.getpid()
-        # start keyboard listener to detect Ctrl+C user intent
+        # fed by the clipboard watcher thread whenever the OS reports a clipboard update
+        self._changes = queue.Queue()
+        self._events = False
+        # current polling interval when no watcher is available (adaptive, see _wait_for_change)
+        self._sleep = POLL_INTERVAL
+        self._idle_ticks = 0
+        # rolling process snapshot refreshed on idle ticks; used as the attribution "before" image
+        self._last_proc_snapshot = None
+        self._last_proc_snapshot_ts = 0.0
         try:
             start_listener()
         except Exception:
             pass
-        # get trusted addresses list from config if present (useful to preload your own wallets)
+        if ATTRIBUTION_WORKER:
+            try:
+                attributor_worker.start_worker()
+            except Exception:
+                pass
+        # suspicious changes are restored on the monitor thread; attribution, logging,
+        # notifications and termination happen on the incident worker
+        self._events_q = queue.Queue(maxsize=INCIDENT_QUEUE_SIZE)
+        self._incident_thread = threading.Thread(target=self._incident_worker, name="incident-worker", daemon=True)
+        self._incident_thread.start()
         from . import config as _cfg
-
         self._pretrusted = getattr(_cfg, "TRUSTED_ADDRESSES", []) or []
+        # exact-match fast path for pretrusted values; substring matches still use _pretrusted
+        self._pretrusted_hashes = frozenset(hash_value(a) for a in self._pretrusted)
+        # exact exe-basename lookup set, plus a tuple for the substring scan over process names
+        self._whitelist_exes = WHITELIST_LOWER
+        self._whitelist_lower = tuple(WHITELIST_LOWER)
+        # load the trust DB now so the first trust check on the detection path never touches disk
+        try:
+            get_trusted_hashes()
+        except Exception:
+            pass
 
     def _notify(self, title: str, message: str):
         try:
             notification.notify(title=title, message=message, timeout=6)
         except Exception:
-            # plyer may fail silently on some systems; ignore
             pass
 
     def restore_clipboard(self, value: str) -> bool:
@@ -99,10 +143,10 @@ class ClipboardGuardCore:
             return False
         name_l = (name or "").lower()
         exe_basename = (os.path.basename(exe) or "").lower()
-        for w in WHITELIST_NAMES:
-            if w.lower() in name_l or w.lower() == exe_basename:
-                return True
-        return False
+        if exe_basename in self._whitelist_exes:
+            return True
+        # substring match on the name (also covers an exact name match)
+        return any(w in name_l for w in self._whitelist_lower)
 
     def _attempt_terminate(self, pid: int):
         """
@@ -123,76 +167,27 @@ class ClipboardGuardCore:
                 return True, "killed_forcibly"
         except Exception as e:
             return False, f"terminate_failed:{e}"
-class ClipboardGuardCore:
-    def __init__(self):
-        self._last = ""
-        try:
-            self._last = pyperclip.paste() or ""
-        except Exception:
-            self._last = ""
-        self.running = False
-        self.self_pid = os.getpid()
-        try:
-            start_listener()
-        except Exception:
-            pass
-        from . import config as _cfg
-        self._pretrusted = getattr(_cfg, "TRUSTED_ADDRESSES", []) or []
-
-    def _notify(self, title: str, message: str):
-        try:
-            notification.notify(title=title, message=message, timeout=6)
-        except Exception:
-            pass
-
-    def restore_clipboard(self, value: str) -> bool:
-        try:
-            pyperclip.copy(value)
-            return True
-        except Exception:
-            return False
-
-    def _is_whitelisted(self, name: str, exe: str) -> bool:
-        if not name and not exe:
-            return False
-        name_l = (name or "").lower()
-        exe_basename = (os.path.basename(exe) or "").lower()
-        for w in WHITELIST_NAMES:
-            if w.lower() in name_l or w.lower() == exe_basename:
-                return True
-        return False
-
-    def _attempt_terminate(self, pid: int):
-        try:
-            p = psutil.Process(pid)
-        except Exception:
-            return False, "process_not_found"
-        try:
-            p.terminate()
-            try:
-                p.wait(timeout=TERMINATE_WAIT_SECONDS)
-                return True, "terminated_gracefully"
-            except psutil.TimeoutExpired:
-                p.kill()
-                return True, "killed_forcibly"
-        except Exception as e:
-            return False, f"terminate_failed:{e}"
 
     # ✅ FIXED: moved inside class
     def _should_accept_new(self, new_text: str, new_matches: List[tuple]) -> bool:
         trusted = False
+        # hash once; the digest serves both the trust DB and the pretrusted lookup
+        h = hash_value(new_text)
         try:
-            if is_trusted(new_text):
+            if is_trusted_hash(h):
                 return True
         except Exception:
             pass
-        try:
-            for addr in getattr(self, "_pretrusted", []):
-                if addr in new_text:
-                    trusted = True
-                    break
-        except Exception:
-            pass
+        if h in self._pretrusted_hashes:
+            trusted = True
+        else:
+            try:
+                for addr in getattr(self, "_pretrusted", []):
+                    if addr in new_text:
+                        trusted = True
+                        break
+            except Exception:
+                pass
         try:
             if was_recent_user_copy():
                 trusted = True
@@ -205,72 +200,206 @@ class ClipboardGuardCore:
                 trusted = False
         if trusted:
             try:
-                add_trusted(new_text)
+                add_trusted_hash(h)
                 sync_trusted(new_text)
             except Exception:
                 pass
             return True
         return False
 
+    def _refresh_proc_snapshot(self):
+        """Refresh the rolling process snapshot at most once per ATTRIBUTION_SNAPSHOT_INTERVAL."""
+        if attributor_worker.is_running():
+            # the background sampler already keeps recent snapshots
+            return
+        now = time.monotonic()
+        if now - self._last_proc_snapshot_ts < ATTRIBUTION_SNAPSHOT_INTERVAL:
+            return
+        try:
+            self._last_proc_snapshot = snapshot_processes()
+            self._last_proc_snapshot_ts = now
+        except Exception:
+            self._last_proc_snapshot = None
+
+    def _identify_suspects(self, detected_at: float) -> list:
+        """Top suspects from the background sampler, or from our own rolling snapshot."""
+        suspects = None
+        if attributor_worker.is_running():
+            suspects = attributor_worker.recent_suspects(top_k=ATTRIBUTION_TOP_K, detected_at=detected_at)
+        if suspects is None:
+            suspects = identify_suspects(
+                window_seconds=ATTRIBUTION_SNAPSHOT_INTERVAL,
+                top_k=ATTRIBUTION_TOP_K,
+                before=self._last_proc_snapshot,
+                detected_at=detected_at,
+            )
+        return suspects
+
+    def _incident_worker(self):
+        """Consume suspicious changes: attribute, log, notify and optionally terminate the suspect."""
+        while True:
+            prev, current, types, restored, ts, detected_at = self._events_q.get()
+            try:
+                self._handle_incident(prev, current, types, restored, ts, detected_at)
+            except Exception as e:
+                print(f"[!] Incident handling failed: {e}")
+            finally:
+                self._events_q.task_done()
+
+    def _handle_incident(self, prev: str, current: str, types: list, restored: bool, ts: str,
+                         detected_at: float):
+        suspects = self._identify_suspects(detected_at)
+        filtered = []
+        for s in suspects:
+            if s.get("pid") == self.self_pid:
+                continue
+            if self._is_whitelisted(s.get("name", ""), s.get("exe", "")):
+                continue
+            filtered.append(s)
+        suspect_info = [format_suspect(s) for s in filtered] or ["unknown_or_whitelisted"]
+        log_event("suspicious_change", prev, current, types + suspect_info, ts=ts)
+        top_msg = suspect_info[0]
+        try:
+            self._notify("ClipboardGuard - Suspicious change", f"Detected {types}. Suspect: {top_msg}")
+        except Exception:
+            pass
+        if restored:
+            self._notify("ClipboardGuard", "Clipboard restored due to suspected hijack.")
+            log_event("restored", prev, current, types + ["restored"], ts=ts)
+        else:
+            self._notify("ClipboardGuard", "Warning: clipboard hijack suspected but restore failed.")
+            log_event("restore_failed", prev, current, types, ts=ts)
+        if AUTO_TERMINATE and filtered:
+            top_pid = filtered[0]["pid"]
+            ok, status = self._attempt_terminate(top_pid)
+            if ok:
+                self._notify("ClipboardGuard", f"Terminated suspect pid={top_pid} ({status})")
+                log_event("terminated", prev, current, [f"pid={top_pid}", status], ts=ts)
+            else:
+                self._notify("ClipboardGuard", f"Failed to terminate pid={top_pid}: {status}")
+                log_event("terminate_failed", prev, current, [f"pid={top_pid}", status], ts=ts)
+
+    def _read_if_changed(self):
+        """
+        Return the clipboard text, or None when the OS change counter shows nothing was
+        written since the last read (the clipboard data is not fetched at all) or when the
+        read failed. The counter is only recorded after a successful read, so a failed read
+        (e.g. clipboard held open by another process) is retried on the next tick.
+        """
+        token = change_token()
+        if token is not None and token == self._last_token:
+            return None
+        try:
+            text = clipboard_fast.paste()
+        except Exception:
+            text = None
+        if text is not None:
+            self._last_token = token
+        return text
+
+    def _on_clipboard_update(self):
+        """Watcher callback (runs on the watcher thread)."""
+        self._changes.put_nowait(time.monotonic())
+
+    def _wait_for_change(self, changed: bool):
+        """
+        Block until the clipboard may have changed.
+        With OS notifications this wakes on the first queued update (or after WATCHDOG_INTERVAL)
+        and coalesces any burst of updates into one clipboard read.
+        When polling, the interval drops to POLL_INTERVAL_MIN after a change or a recent
+        Ctrl+C/Ctrl+Insert, stays there for POLL_IDLE_GRACE_TICKS unchanged reads (copy/paste
+        bursts), then returns to POLL_INTERVAL and backs off by POLL_BACKOFF per idle tick up to
+        POLL_INTERVAL_MAX.
+        """
+        if self._events:
+            try:
+                self._changes.get(timeout=WATCHDOG_INTERVAL)
+                while True:
+                    self._changes.get_nowait()
+            except queue.Empty:
+                pass
+            return
+        try:
+            user_copy = was_recent_user_copy()
+        except Exception:
+            user_copy = False
+        if changed or user_copy:
+            self._idle_ticks = 0
+            self._sleep = POLL_INTERVAL_MIN
+        else:
+            self._idle_ticks += 1
+            if self._idle_ticks > POLL_IDLE_GRACE_TICKS:
+                self._sleep = min(max(self._sleep * POLL_BACKOFF, POLL_INTERVAL), POLL_INTERVAL_MAX)
+        time.sleep(self._sleep)
+
+    def _tick(self) -> bool:
+        """One monitor iteration. Returns True if the clipboard text changed."""
+        current = self._read_if_changed()
+        changed = current is not None and current != self._last
+        if changed:
+            self._handle_change(current)
+        else:
+            self._refresh_proc_snapshot()
+        return changed
+
+    def _handle_change(self, current: str):
+        """Classify a new clipboard value and update self._last / self._last_matches."""
+        if current.strip() == self._last.strip():
+            # whitespace-only edit around the same content: nothing new to detect
+            self._last = current
+            return
+        suspicious, new_matches = is_suspicious_change(self._last, current, prev_matches=self._last_matches)
+        if new_matches and self._should_accept_new(current, new_matches):
+            print("[*] Sensitive clipboard value accepted (trusted or user-copied).")
+            log_event("accepted_trusted", self._last, current, [t for t, _ in new_matches])
+            self._last = current
+            self._last_matches = new_matches
+            return
+        restored = self._handle_suspicious(current, new_matches) if suspicious else False
+        # no need to re-read the clipboard: after a successful restore it holds self._last,
+        # otherwise it holds current
+        if not restored:
+            self._last = current
+            self._last_matches = new_matches
+
+    def _handle_suspicious(self, current: str, new_matches) -> bool:
+        """
+        Restore the previous value and hand the incident to the incident worker.
+        Returns True if the clipboard was restored.
+        """
+        types = [t for t, _ in new_matches] if new_matches else []
+        print(f"[!] Suspicious clipboard change detected. Types: {types}")
+        ts = datetime.utcnow().isoformat() + "Z"
+        detected_at = time.monotonic()
+        restored = self.restore_clipboard(self._last)
+        if restored:
+            print("[*] Restored previous clipboard value.")
+        else:
+            print("[!] Failed to restore clipboard.")
+        try:
+            self._events_q.put_nowait((self._last, current, types, restored, ts, detected_at))
+        except queue.Full:
+            print("[!] Incident queue full; attribution/logging skipped for this change.")
+        return restored
+
     # ✅ FIXED: moved inside class
     def start(self):
         self.running = True
-        print("[*] ClipboardGuard started. Monitoring clipboard...")
-        while self.running:
+        if USE_CLIPBOARD_EVENTS:
             try:
-                current = pyperclip.paste() or ""
+                self._events = start_watcher(self._on_clipboard_update)
             except Exception:
-                current = ""
-            if current != self._last:
-                suspicious, new_matches = is_suspicious_change(self._last, current)
-                if new_matches:
-                    if self._should_accept_new(current, new_matches):
-                        print("[*] Sensitive clipboard value accepted (trusted or user-copied).")
-                        log_event("accepted_trusted", self._last, current, [t for t, _ in new_matches])
-                        self._last = current
-                        time.sleep(POLL_INTERVAL)
-                        continue
-                if suspicious:
-                    types = [t for t, _ in new_matches] if new_matches else []
-                    print(f"[!] Suspicious clipboard change detected. Types: {types}")
-                    suspects = identify_suspects(window_seconds=ATTRIBUTION_SNAPSHOT_INTERVAL, top_k=ATTRIBUTION_TOP_K)
-                    filtered = []
-                    for s in suspects:
-                        if s.get("pid") == self.self_pid:
-                            continue
-                        if self._is_whitelisted(s.get("name", ""), s.get("exe", "")):
-                            continue
-                        filtered.append(s)
-                    suspect_info = [format_suspect(s) for s in filtered] or ["unknown_or_whitelisted"]
-                    log_event("suspicious_change", self._last, current, types + suspect_info)
-                    top_msg = suspect_info[0]
-                    try:
-                        self._notify("ClipboardGuard - Suspicious change", f"Detected {types}. Suspect: {top_msg}")
-                    except Exception:
-                        pass
-                    restored = self.restore_clipboard(self._last)
-                    if restored:
-                        print("[*] Restored previous clipboard value.")
-                        self._notify("ClipboardGuard", "Clipboard restored due to suspected hijack.")
-                        log_event("restored", self._last, current, types + ["restored"])
-                    else:
-                        print("[!] Failed to restore clipboard.")
-                        self._notify("ClipboardGuard", "Warning: clipboard hijack suspected but restore failed.")
-                        log_event("restore_failed", self._last, current, types)
-                    if AUTO_TERMINATE and filtered:
-                        top_pid = filtered[0]["pid"]
-                        ok, status = self._attempt_terminate(top_pid)
-                        if ok:
-                            self._notify("ClipboardGuard", f"Terminated suspect pid={top_pid} ({status})")
-                            log_event("terminated", self._last, current, [f"pid={top_pid}", status])
-                        else:
-                            self._notify("ClipboardGuard", f"Failed to terminate pid={top_pid}: {status}")
-                            log_event("terminate_failed", self._last, current, [f"pid={top_pid}", status])
-                try:
-                    self._last = pyperclip.paste() or ""
-                except Exception:
-                    self._last = ""
-            time.sleep(POLL_INTERVAL)
+                self._events = False
+        mode = "clipboard notifications" if self._events else "polling"
+        print(f"[*] ClipboardGuard started. Monitoring clipboard ({mode})...")
+        while self.running:
+            changed = False
+            # the only broad handler on the hot path: one failed tick must not stop monitoring
+            try:
+                changed = self._tick()
+            except Exception as e:
+                print(f"[!] Monitor tick failed: {e}")
+            self._wait_for_change(changed)
 
 if __name__ == "__main__":
     guard = ClipboardGuardCore()
@@ -1,20 +1,94 @@
 # clipboardguard/sync_web.py
+"""
+Push trusted/untrusted values to the Flask web app.
+
+Posts are queued and sent by a background worker over one kept-alive requests.Session,
+so the monitor loop never waits on the network. If the web app is down the queue is
+bounded by SYNC_QUEUE_SIZE and the oldest pending posts are dropped.
+Re-approving the same trusted value within SYNC_DEDUP_WINDOW seconds is not re-posted.
+"""
+import queue
+import threading
+import time
+from collections import OrderedDict
+
 import requests
-import os
+
+from .config import SYNC_QUEUE_SIZE, SYNC_DEDUP_WINDOW, SYNC_DEDUP_MAX
 
 # Adjust this URL if Flask runs on a different port
 WEB_API_BASE = "http://127.0.0.1:5000/api"
 
-def sync_trusted(value: str):
-    """Send newly trusted value to Flask app."""
+_q = queue.Queue(maxsize=SYNC_QUEUE_SIZE)
+_session = None
+_worker = None
+_worker_lock = threading.Lock()
+# hash(value) -> monotonic time of the last successful trusted post, oldest first
+_recent = OrderedDict()
+_recent_lock = threading.Lock()
+
+def _post(kind: str, value: str) -> bool:
+    """POST one value; returns True if the web app accepted it."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
     try:
-        requests.post(f"{WEB_API_BASE}/trusted_sync", json={"address": value}, timeout=2)
+        resp = _session.post(f"{WEB_API_BASE}/{kind}_sync", json={"address": value}, timeout=2)
+        return resp.ok
     except Exception as e:
-        print(f"[!] Failed to sync trusted value: {e}")
+        print(f"[!] Failed to sync {kind} value: {e}")
+        return False
+
+def _run():
+    while True:
+        kind, value = _q.get()
+        if kind == "trusted":
+            # an identical approval queued earlier may have been posted meanwhile
+            if _recently_synced(value):
+                continue
+            if _post(kind, value):
+                _mark_synced(value)
+        else:
+            _post(kind, value)
+
+def _enqueue(kind: str, value: str):
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="sync-web", daemon=True)
+            _worker.start()
+        while True:
+            try:
+                _q.put_nowait((kind, value))
+                return
+            except queue.Full:
+                # web app unreachable/slow: keep the newest posts
+                try:
+                    _q.get_nowait()
+                except queue.Empty:
+                    pass
+
+def _recently_synced(value: str) -> bool:
+    """True if value was successfully posted within SYNC_DEDUP_WINDOW."""
+    with _recent_lock:
+        last = _recent.get(hash(value))
+    return last is not None and time.monotonic() - last < SYNC_DEDUP_WINDOW
+
+def _mark_synced(value: str):
+    """Record a successful post (called by the worker, so dropped/failed posts are retried)."""
+    h = hash(value)
+    with _recent_lock:
+        _recent[h] = time.monotonic()
+        _recent.move_to_end(h)
+        if len(_recent) > SYNC_DEDUP_MAX:
+            _recent.popitem(last=False)
+
+def sync_trusted(value: str):
+    """Send newly trusted value to Flask app."""
+    if _recently_synced(value):
+        return
+    _enqueue("trusted", value)
 
 def sync_untrusted(value: str):
     """Notify Flask app about untrusted/suspicious value."""
-    try:
-        requests.post(f"{WEB_API_BASE}/untrusted_sync", json={"address": value}, timeout=2)
-    except Exception as e:
-        print(f"[!] Failed to sync untrusted value: {e}")
+    _enqueue("untrusted", value)
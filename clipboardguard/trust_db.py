@@ -2,36 +2,126 @@
 """
 Small trust database to remember user-approved clipboard values.
 We store hashes (sha256) so we don't keep raw clipboard values in plaintext logs.
+
+Hashes live in an append-only log (one base64 digest per line): adding a value appends
+one line instead of rewriting the whole file, and the log is compacted on load.
+
+Digests are sha256 truncated to 16 bytes (128 bits is plenty for a trust lookup). Because
+they are a prefix of the full sha256, hex entries written by older versions convert in place.
+In memory the hashes are kept as raw bytes; callers that need several lookups for the same
+value can hash it once with hash_value() and use the *_hash API.
 """
 
+import base64
+import binascii
 import json
 import os
 import hashlib
+import functools
 from threading import Lock
 
 from .config import BASE_DIR
 
-_TRUST_FILE = os.path.join(BASE_DIR, "trusted_clipboard.json")
+# append-only log, one base64 digest per line
+_TRUST_FILE = os.path.join(BASE_DIR, "trusted_clipboard.log")
+# pre-log format ({"hashes": [...]}); read once to migrate when the log does not exist
+_LEGACY_TRUST_FILE = os.path.join(BASE_DIR, "trusted_clipboard.json")
+# rewrite the log on load once it has this many lines per unique hash
+_COMPACT_RATIO = 2
+_DIGEST_SIZE = 16
+# length of a full sha256 hexdigest as stored by older versions
+_LEGACY_HEX_LEN = 64
 _lock = Lock()
 
-def _hash_value(val: str) -> str:
-    return hashlib.sha256((val or "").encode('utf-8')).hexdigest()
+# values up to this length (addresses, emails, short tokens) have their digests memoized
+_HASH_CACHE_MAX_LEN = 512
+
+def _sha256(val: str) -> bytes:
+    return hashlib.sha256((val or "").encode('utf-8', 'ignore')).digest()[:_DIGEST_SIZE]
+
+_sha256_cached = functools.lru_cache(maxsize=256)(_sha256)
+
+def hash_value(val: str) -> bytes:
+    """
+    Return the truncated sha256 digest of a clipboard value (hashlib uses SHA-NI where the CPU has it).
+    Short values are memoized since the same address is typically pasted many times; large
+    payloads are hashed directly so the cache never pins big strings in memory.
+    """
+    if val and len(val) <= _HASH_CACHE_MAX_LEN:
+        return _sha256_cached(val)
+    return _sha256(val)
+
+def _load_legacy_json() -> set:
+    """Read hashes from the old trusted_clipboard.json format."""
+    try:
+        with open(_LEGACY_TRUST_FILE, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+    except Exception:
+        return set()
+    hashes = set()
+    for h in data.get("hashes", []):
+        try:
+            hashes.add(bytes.fromhex(h)[:_DIGEST_SIZE])
+        except (TypeError, ValueError):
+            continue
+    return hashes
 
 def load_trusted() -> set:
+    """
+    Read the trust log into a set of digests. The log is compacted (rewritten with one
+    line per unique hash) when more than half of its lines are duplicates or when it still
+    contains hex lines from older versions. If no log exists
+    yet, hashes from the legacy JSON file are migrated into a fresh log.
+    """
     if not os.path.exists(_TRUST_FILE):
-        return set()
+        hashes = _load_legacy_json()
+        if hashes:
+            save_trusted(hashes)
+        return hashes
+    hashes = set()
+    lines = 0
+    legacy = False
     try:
         with open(_TRUST_FILE, 'r', encoding='utf-8') as fh:
-            data = json.load(fh)
-            return set(data.get("hashes", []))
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    if len(line) == _LEGACY_HEX_LEN:
+                        hashes.add(bytes.fromhex(line)[:_DIGEST_SIZE])
+                        legacy = True
+                    else:
+                        hashes.add(base64.b64decode(line, validate=True))
+                except (ValueError, binascii.Error):
+                    continue
     except Exception:
         return set()
+    if legacy or lines > _COMPACT_RATIO * len(hashes):
+        save_trusted(hashes)
+    return hashes
+
+def _encode(h: bytes) -> str:
+    return base64.b64encode(h).decode('ascii') + "\n"
 
 def save_trusted(hashes: set):
+    """Rewrite the trust log with one base64 hash per line (used for migration and compaction)."""
     try:
         with _lock:
-            with open(_TRUST_FILE, 'w', encoding='utf-8') as fh:
-                json.dump({"hashes": list(hashes)}, fh, indent=2)
+            tmp = _TRUST_FILE + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                fh.writelines(_encode(h) for h in hashes)
+            os.replace(tmp, _TRUST_FILE)
+    except Exception:
+        pass
+
+def _append_trusted(h: bytes):
+    """Append a single hash to the trust log; one small write instead of a full rewrite."""
+    try:
+        with _lock:
+            with open(_TRUST_FILE, 'a', encoding='utf-8') as fh:
+                fh.write(_encode(h))
     except Exception:
         pass
 
@@ -44,14 +134,17 @@ def get_trusted_hashes():
         _trusted_hashes = load_trusted()
     return _trusted_hashes
 
-def add_trusted(value: str):
-    global _trusted_hashes
-    h = _hash_value(value)
+def add_trusted_hash(h: bytes):
     th = get_trusted_hashes()
     if h not in th:
         th.add(h)
-        save_trusted(th)
+        _append_trusted(h)
 
-def is_trusted(value: str) -> bool:
-    h = _hash_value(value)
+def is_trusted_hash(h: bytes) -> bool:
     return h in get_trusted_hashes()
+
+def add_trusted(value: str):
+    add_trusted_hash(hash_value(value))
+
+def is_trusted(value: str) -> bool:
+    return is_trusted_hash(hash_value(value))
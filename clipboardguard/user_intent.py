@@ -12,8 +12,9 @@ from pynput import keyboard
 # how long after a keypress (seconds) we consider a clipboard change as user-initiated
 USER_COPY_WINDOW = 1.0
 
-# last timestamp we saw a user copy key combo
-_last_user_copy_ts = 0.0
+# last time.monotonic_ns() we saw a user copy key combo (0 = never); monotonic so
+# NTP/wall-clock adjustments can't make a stale copy look recent
+_last_user_copy_ts = 0
 _listener = None
 
 def _on_press(key):
@@ -26,39 +27,42 @@ def _on_press(key):
         pass
 
 # Instead of low-level detection: use on_release and check modifiers in context
-_current_modifiers = set()
+# Held keys as a bitmask (cheaper than a set of strings on every keystroke)
+CTRL = 1
+C = 2
+INSERT = 4
+_CTRL_C = CTRL | C
+_CTRL_INSERT = CTRL | INSERT
+_mods = 0
+
+def _key_bit(key) -> int:
+    if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
+        return CTRL
+    if key == keyboard.Key.insert:
+        # ctrl+insert is another copy combo variant; we'll check modifiers on release
+        return INSERT
+    if hasattr(key, 'char') and key.char and key.char.lower() == 'c':
+        return C
+    return 0
 
 def _on_press_inner(key):
+    global _mods
     try:
-        if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-            _current_modifiers.add('ctrl')
-        elif key == keyboard.Key.insert:
-            # ctrl+insert is another copy combo variant; we'll check modifiers on release
-            _current_modifiers.add('insert')
-        elif hasattr(key, 'char') and key.char and key.char.lower() == 'c':
-            _current_modifiers.add('c')
+        _mods |= _key_bit(key)
     except Exception:
         pass
 
 def _on_release_inner(key):
-    global _last_user_copy_ts
+    global _last_user_copy_ts, _mods
     try:
-        # if we have ctrl + c pressed together (order independent), mark copy event
-        if 'ctrl' in _current_modifiers and 'c' in _current_modifiers:
-            _last_user_copy_ts = time.time()
-        # ctrl+insert: ctrl + insert
-        if 'ctrl' in _current_modifiers and 'insert' in _current_modifiers:
-            _last_user_copy_ts = time.time()
+        # ctrl + c or ctrl + insert held together (order independent): mark copy event
+        if (_mods & _CTRL_C) == _CTRL_C or (_mods & _CTRL_INSERT) == _CTRL_INSERT:
+            _last_user_copy_ts = time.monotonic_ns()
     except Exception:
         pass
-    # clean modifiers set when keys are released
+    # clear the released key's bit
     try:
-        if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-            _current_modifiers.discard('ctrl')
-        elif key == keyboard.Key.insert:
-            _current_modifiers.discard('insert')
-        elif hasattr(key, 'char') and key.char and key.char.lower() == 'c':
-            _current_modifiers.discard('c')
+        _mods &= ~_key_bit(key)
     except Exception:
         pass
 
@@ -83,6 +87,6 @@ def was_recent_user_copy(window_seconds=USER_COPY_WINDOW) -> bool:
     """
     Return True if a user copy event (Ctrl+C or Ctrl+Insert) occurred within window_seconds.
     """
-    if _last_user_copy_ts == 0.0:
+    if _last_user_copy_ts == 0:
         return False
-    return (time.time() - _last_user_copy_ts) <= window_seconds
+    return (time.monotonic_ns() - _last_user_copy_ts) <= int(window_seconds * 1e9)
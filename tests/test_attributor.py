@@ -0,0 +1,71 @@
+# tests/test_attributor.py
+"""
+Regression tests for attribution caching (run: python -m unittest tests.test_attributor).
+"""
+import unittest
+from unittest import mock
+
+from clipboardguard import attributor
+
+
+class _FakeProcess:
+    """Stand-in for psutil.Process backed by a {pid: (create_time, name)} table."""
+    table = {}
+
+    def __init__(self, pid):
+        self.pid = pid
+        self._create_time, self._name = self.table[pid]
+
+    def create_time(self):
+        return self._create_time
+
+    def oneshot(self):
+        return mock.MagicMock()
+
+    def name(self):
+        return self._name
+
+    def exe(self):
+        return ""
+
+
+class TopSuspectsCacheTest(unittest.TestCase):
+    def setUp(self):
+        attributor._cache = (None, None, None, None)
+        attributor._proc_info.clear()
+        _FakeProcess.table = {100: (1.0, "p100"), 200: (1.0, "p200")}
+        patcher = mock.patch.object(attributor.psutil, "Process", _FakeProcess, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_new_incident_with_same_totals_is_not_served_from_cache(self):
+        # same process count and total write_bytes in every snapshot (clipboard writes cause
+        # no disk I/O); only the CPU time of the hijacking process differs
+        base = {100: (1000, 1.0), 200: (2000, 1.0)}
+        incident1 = {100: (1000, 1.5), 200: (2000, 1.0)}
+        incident2 = {100: (1000, 1.5), 200: (2000, 1.7)}
+        first = attributor.top_suspects(base, incident1, top_k=1)
+        second = attributor.top_suspects(incident1, incident2, top_k=1)
+        self.assertEqual(first[0]["pid"], 100)
+        self.assertEqual(second[0]["pid"], 200)
+
+    def test_same_snapshots_reuse_previous_result(self):
+        before = {100: (0, 0.0)}
+        after = {100: (10, 0.5)}
+        first = attributor.top_suspects(before, after, top_k=1)
+        second = attributor.top_suspects(before, after, top_k=1)
+        self.assertEqual(first, second)
+        self.assertEqual(second[0]["pid"], 100)
+
+    def test_reused_pid_is_resolved_again(self):
+        _FakeProcess.table = {4321: (1.0, "svchost.exe")}
+        first = attributor.top_suspects({4321: (0, 0.0)}, {4321: (0, 0.5)}, top_k=1)
+        # pid exits and is reused by another process between incidents
+        _FakeProcess.table = {4321: (2.0, "evil.exe")}
+        second = attributor.top_suspects({4321: (0, 0.0)}, {4321: (0, 0.9)}, top_k=1)
+        self.assertEqual(first[0]["name"], "svchost.exe")
+        self.assertEqual(second[0]["name"], "evil.exe")
+
+
+if __name__ == "__main__":
+    unittest.main()
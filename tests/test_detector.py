@@ -0,0 +1,22 @@
+# tests/test_detector.py
+"""
+Regression tests for sensitive-pattern matching (run: python -m unittest tests.test_detector).
+"""
+import unittest
+
+from clipboardguard import detector
+
+
+class FindSensitiveMatchesTest(unittest.TestCase):
+    def test_overlapping_matches_of_different_types_are_all_reported(self):
+        eth = "0x" + "ab" * 20
+        matches = detector.find_sensitive_matches("a.b." + eth)
+        self.assertIn(("crypto_address", eth), matches)
+        self.assertIn(("jwt", "a.b." + eth), matches)
+
+    def test_text_without_trigger_substrings_has_no_matches(self):
+        self.assertEqual(detector.find_sensitive_matches("hello world"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
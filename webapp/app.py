@@ -1,8 +1,14 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file
-import os, csv, json, time
+import os, csv, io, json, time, atexit, threading
 from datetime import datetime
 import pyperclip
 
+# orjson (C, SIMD) is much faster than stdlib json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 APP_ROOT = os.path.dirname(__file__)
 LOG_CSV = os.path.join(APP_ROOT, "logs.csv")
 TRUSTED_JSON = os.path.join(APP_ROOT, "trusted.json")
@@ -12,6 +18,54 @@ app = Flask(__name__, static_folder="static", template_folder="templates")
 
 # --------- File Setup & Helpers ----------
 
+# log_event keeps logs.csv open and flushes every LOG_FLUSH_INTERVAL seconds or LOG_FLUSH_ROWS rows
+LOG_FLUSH_INTERVAL = 1.0
+LOG_FLUSH_ROWS = 32
+_log_lock = threading.Lock()
+_log_fh = None
+_log_writer = None
+_log_pending = 0
+_log_flusher = None
+
+# initial bytes read from the end of logs.csv by tail_csv (doubled until enough rows)
+_TAIL_CHUNK = 8192
+
+# path -> (st_mtime_ns, st_size, parsed data); re-read only when the file changed on disk
+_json_cache = {}
+
+
+def _dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(path):
+    """Load a JSON file, served from _json_cache while its mtime/size are unchanged. Treat as read-only."""
+    st = os.stat(path)
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(path, "rb") as f:
+        data = _loads(f.read())
+    _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def write_json(path, data):
+    """Write a JSON file and refresh its cache entry."""
+    with open(path, "wb") as f:
+        f.write(_dumps(data))
+    st = os.stat(path)
+    _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+
+
 def ensure_files():
     """Ensure all storage files exist"""
     if not os.path.exists(LOG_CSV):
@@ -20,47 +74,131 @@ def ensure_files():
             writer.writerow(["timestamp", "event", "prev_clip", "new_clip", "meta"])
 
     if not os.path.exists(TRUSTED_JSON):
-        with open(TRUSTED_JSON, "w", encoding="utf-8") as f:
-            json.dump({"trusted": []}, f, indent=2)
+        write_json(TRUSTED_JSON, {"trusted": []})
 
     if not os.path.exists(TX_JSON):
-        with open(TX_JSON, "w", encoding="utf-8") as f:
-            json.dump({"tx": []}, f, indent=2)
+        write_json(TX_JSON, {"tx": []})
+
+
+def _flush_log_locked():
+    global _log_pending
+    if _log_fh is not None and _log_pending:
+        _log_fh.flush()
+    _log_pending = 0
+
+
+def flush_log():
+    """Write buffered log rows to disk."""
+    with _log_lock:
+        _flush_log_locked()
+
+
+def _close_log_locked():
+    global _log_fh, _log_writer, _log_pending
+    if _log_fh is not None:
+        _log_fh.close()
+    _log_fh = None
+    _log_writer = None
+    _log_pending = 0
+
+
+def _close_log():
+    with _log_lock:
+        _close_log_locked()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        try:
+            flush_log()
+        except Exception:
+            pass
 
 
 def log_event(event, prev, new, meta=""):
-    """Append a log entry to CSV"""
-    ensure_files()
+    """Append a log entry to CSV (buffered; see flush_log)"""
+    global _log_fh, _log_writer, _log_pending, _log_flusher
     ts = datetime.utcnow().isoformat() + "Z"
-    with open(LOG_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([ts, event, prev, new, meta])
+    with _log_lock:
+        if _log_fh is None:
+            ensure_files()
+            _log_fh = open(LOG_CSV, "a", newline="", buffering=8192, encoding="utf-8")
+            _log_writer = csv.writer(_log_fh)
+        _log_writer.writerow([ts, event, prev, new, meta])
+        _log_pending += 1
+        if _log_pending >= LOG_FLUSH_ROWS:
+            _flush_log_locked()
+        if _log_flusher is None:
+            _log_flusher = threading.Thread(target=_flush_loop, name="log-flusher", daemon=True)
+            _log_flusher.start()
+
+
+atexit.register(_close_log)
+
+
+def _parse_tail(text, ncols):
+    """
+    Parse CSV text cut from the middle of the log. Returns None if it does not look like
+    whole rows, i.e. the cut landed inside a quoted field that spans lines.
+    """
+    try:
+        rows = [r for r in csv.reader(io.StringIO(text), strict=True) if r]
+    except csv.Error:
+        return None
+    for r in rows:
+        if len(r) != ncols or not (r[0][:4].isdigit() and r[0][4:5] == "-"):
+            return None
+    return rows
+
+
+def tail_csv(path, limit):
+    """
+    Return the last `limit` rows of a CSV as dicts, reading only the end of the file.
+    The window starts at _TAIL_CHUNK bytes and doubles until it holds `limit` rows.
+    Falls back to parsing the whole file if the window can't be parsed cleanly
+    (older rows may contain newlines inside quoted fields).
+    """
+    with open(path, "rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        header = next(csv.reader([header_line.decode("utf-8", "replace")]), [])
+        window = _TAIL_CHUNK
+        while True:
+            start = max(data_start, size - window)
+            f.seek(start)
+            tail = f.read(size - start)
+            if start > data_start:
+                # drop the partial first line
+                tail = tail.split(b"\n", 1)[1] if b"\n" in tail else b""
+            rows = _parse_tail(tail.decode("utf-8", "replace"), len(header))
+            if rows is None:
+                break
+            if len(rows) >= limit or start == data_start:
+                return [dict(zip(header, r)) for r in rows[-limit:]]
+            window *= 2
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))[-limit:]
 
 
 def read_logs(limit=200):
     """Read recent logs"""
-    ensure_files()
-    rows = []
-    with open(LOG_CSV, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
-    return rows[-limit:][::-1]
+    flush_log()
+    return tail_csv(LOG_CSV, limit)[::-1]
 
 
 def read_trusted():
-    ensure_files()
-    with open(TRUSTED_JSON, "r", encoding="utf-8") as f:
-        return json.load(f).get("trusted", [])
+    # copy: callers append/remove before save_trusted
+    return list(read_json(TRUSTED_JSON).get("trusted", []))
 
 
 def save_trusted(values):
-    with open(TRUSTED_JSON, "w", encoding="utf-8") as f:
-        json.dump({"trusted": values}, f, indent=2)
+    write_json(TRUSTED_JSON, {"trusted": values})
 
 
 def add_transaction(address):
-    ensure_files()
     tx = {
         "id": int(time.time()),
         "address": address,
@@ -68,20 +206,19 @@ def add_transaction(address):
         "timestamp": datetime.utcnow().isoformat() + "Z"
     }
 
-    with open(TX_JSON, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    data["tx"].append(tx)
-
-    with open(TX_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    data = read_json(TX_JSON)
+    data = dict(data, tx=data.get("tx", []) + [tx])
+    write_json(TX_JSON, data)
 
     return tx
 
+# create storage files once at import (also covers WSGI servers, which skip __main__)
+ensure_files()
+
 # --------- Routes ----------
 
 @app.route("/")
 def index():
-    ensure_files()
     try:
         current_clipboard = pyperclip.paste()
     except Exception:
@@ -173,12 +310,13 @@ def untrusted_sync():
 
 @app.route("/logs/clear", methods=["POST"])
 def clear_logs():
-    ensure_files()
     try:
-        # Overwrite CSV with header only
-        with open(LOG_CSV, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["timestamp", "event", "prev_clip", "new_clip", "meta"])
+        # Overwrite CSV with header only; drop the buffered handle so the next log_event reopens it
+        with _log_lock:
+            _close_log_locked()
+            with open(LOG_CSV, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["timestamp", "event", "prev_clip", "new_clip", "meta"])
         
         # Log that logs were cleared
         log_event("logs_cleared", "", "", "Cleared all logs via web")
@@ -194,15 +332,14 @@ def api_logs():
 
 @app.route("/api/transactions")
 def api_transactions():
-    ensure_files()
-    with open(TX_JSON, "r", encoding="utf-8") as f:
-        return jsonify(json.load(f))
+    return jsonify(read_json(TX_JSON))
 
 
 @app.route("/download/logs")
 def download_logs():
     if not os.path.exists(LOG_CSV):
         ensure_files()
+    flush_log()
     return send_file(LOG_CSV, as_attachment=True)
 
 